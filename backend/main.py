@@ -1,18 +1,25 @@
-from fastapi import FastAPI, Form
+from fastapi import FastAPI, File, Form, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import cv2
-import base64
+import binascii
+import json
 import numpy as np
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 import os
 from pydantic import BaseModel
 from typing import Optional
 from dotenv import load_dotenv
+from deepface import DeepFace
 
 # Load environment variables from .env 
 load_dotenv()
 
-app = FastAPI(title="Emotion-Aware AI Assistant API")
+app = FastAPI(
+    title="Emotion-Aware AI Assistant API",
+    default_response_class=ORJSONResponse  # orjson: faster JSON encoding
+)
 
 # CORS middleware to allow frontend communication
 app.add_middleware(
@@ -23,10 +30,144 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# No initialization needed for DeepFace - it's imported directly when used
+# DeepFace emotion model, built once at startup (see load_emotion_model)
+EMOTION_MODEL = None
 
 # Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Async client so concurrent chats don't block the event loop
+client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=100))
+)
+
+
+@app.on_event("startup")
+def load_emotion_model():
+    """
+    Build the DeepFace emotion model once so requests don't pay the load.
+
+    DeepFace caches built models internally, so later DeepFace.analyze
+    calls reuse this instance instead of reloading the weights.
+    """
+    global EMOTION_MODEL
+
+    try:
+        try:
+            # Newer DeepFace versions require the task for attribute models
+            EMOTION_MODEL = DeepFace.build_model("Emotion", task="facial_attribute")
+        except TypeError:
+            EMOTION_MODEL = DeepFace.build_model("Emotion")
+
+        print("✅ DeepFace emotion model loaded")
+    except Exception as e:
+        # Keep the server (and chat endpoints) up; DeepFace.analyze will
+        # load the model lazily on the first /api/emotion request
+        EMOTION_MODEL = None
+        print(f"⚠️  Could not prebuild DeepFace emotion model: {e}")
+
+
+def decode_image(image: Optional[str], file_bytes: Optional[bytes] = None):
+    """
+    Decode an uploaded frame into a BGR OpenCV image.
+
+    Args:
+        image: Base64 string, optionally a data URL ("data:image/jpeg;base64,...")
+        file_bytes: Raw encoded image bytes (skips base64 entirely)
+
+    Returns:
+        BGR image as numpy array
+    """
+    if file_bytes is not None:
+        imgdata = file_bytes
+    elif image:
+        # a2b_base64 reads an ASCII str in place (no encode() copy); only
+        # a data URL pays one copy of the text to slice off its header
+        b64 = image[image.find(',') + 1:] if image.startswith('data:') else image
+        imgdata = binascii.a2b_base64(b64)
+    else:
+        raise ValueError("No image provided")
+
+    return cv2.imdecode(np.frombuffer(imgdata, np.uint8), cv2.IMREAD_COLOR)
+
+
+# Emotion-specific system prompts (built once, response guideline baked in)
+RESPONSE_GUIDELINE = "\nKeep responses conversational, natural, and under 150 words unless more detail is specifically needed."
+
+EMOTION_PROMPTS = {
+    emotion: (prompt + RESPONSE_GUIDELINE).strip()
+    for emotion, prompt in {
+        "angry": """
+        You are an empathetic AI assistant. The user appears frustrated or angry.
+        - Be extremely patient and understanding
+        - Use a calm, soothing tone
+        - Acknowledge their feelings
+        - Offer to help resolve their concerns step-by-step
+        - Keep responses clear and concise
+        """,
+        "disgust": """
+        You are a supportive AI assistant. The user appears uncomfortable or displeased.
+        - Be respectful and non-judgmental
+        - Use a professional, neutral tone
+        - Offer alternative perspectives if appropriate
+        - Keep responses factual and helpful
+        """,
+        "fear": """
+        You are a reassuring AI assistant. The user appears worried or anxious.
+        - Be encouraging and supportive
+        - Use a warm, comforting tone
+        - Provide clear, step-by-step guidance
+        - Help break down complex problems into manageable parts
+        - Reassure them that it's okay to ask questions
+        """,
+        "happy": """
+        You are an enthusiastic AI assistant. The user appears happy and positive.
+        - Match their positive energy
+        - Be friendly and engaging
+        - Use a conversational, upbeat tone
+        - Feel free to be slightly more casual
+        - Continue the positive momentum
+        """,
+        "sad": """
+        You are a compassionate AI assistant. The user appears sad or down.
+        - Be gentle and understanding
+        - Use an empathetic, supportive tone
+        - Offer encouragement
+        - Be patient with their questions
+        - Show that you're here to help
+        """,
+        "surprise": """
+        You are an engaging AI assistant. The user appears surprised or curious.
+        - Be informative and clear
+        - Use an interesting, engaging tone
+        - Provide detailed explanations when appropriate
+        - Encourage their curiosity
+        - Make learning enjoyable
+        """,
+        "neutral": """
+        You are a helpful AI assistant. The user appears calm and focused.
+        - Be professional and friendly
+        - Use a balanced, clear tone
+        - Provide thorough but concise answers
+        - Stay on topic
+        """,
+    }.items()
+}
+
+# Prebuilt system messages, shared (never copied) across requests
+SYSTEM_MESSAGES = {
+    emotion: {"role": "system", "content": prompt}
+    for emotion, prompt in EMOTION_PROMPTS.items()
+}
+
+
+def build_messages(emotion: str, message: str):
+    """
+    Build the chat messages for an emotion: shared system message + user message.
+    """
+    return [
+        SYSTEM_MESSAGES.get(emotion, SYSTEM_MESSAGES["neutral"]),
+        {"role": "user", "content": message}
+    ]
 
 
 class ChatRequest(BaseModel):
@@ -39,32 +180,27 @@ async def root():
     return {
         "message": "Emotion-Aware AI Assistant API",
         "version": "1.0.0",
-        "endpoints": ["/api/emotion", "/api/chat"]
+        "endpoints": ["/api/emotion", "/api/chat", "/api/chat/stream"]
     }
 
 #we are
 @app.post("/api/emotion")
-async def detect_emotion(image: str = Form(...)):
+async def detect_emotion(image: Optional[str] = Form(None),
+                         file: Optional[UploadFile] = File(None)):
     """
     Detect emotion from base64 encoded image.
 
     Args:
         image: Base64 encoded image string from webcam
+        file: Raw image upload (alternative to image, no base64 overhead)
 
     Returns:
         dict: Detected emotion and confidence score
     """
     try:
-        from deepface import DeepFace
-
-        # Decode base64 image
-        if ',' in image:
-            imgdata = base64.b64decode(image.split(',')[1])
-        else:
-            imgdata = base64.b64decode(image)
-
-        # Convert to numpy array and decode image
-        img = cv2.imdecode(np.frombuffer(imgdata, np.uint8), cv2.IMREAD_COLOR)
+        # Decode uploaded image (raw file or base64 string)
+        file_bytes = await file.read() if file is not None else None
+        img = decode_image(image, file_bytes)
 
         print(f"Image shape: {img.shape}")  # Debug: Check image dimensions
 
@@ -116,74 +252,10 @@ async def chat_with_emotion(payload: ChatRequest):
         msg = payload.message
         emotion = payload.emotion or "neutral"
 
-        # Create adaptive system prompt based on emotion
-        emotion_prompts = {
-            "angry": """
-            You are an empathetic AI assistant. The user appears frustrated or angry.
-            - Be extremely patient and understanding
-            - Use a calm, soothing tone
-            - Acknowledge their feelings
-            - Offer to help resolve their concerns step-by-step
-            - Keep responses clear and concise
-            """,
-            "disgust": """
-            You are a supportive AI assistant. The user appears uncomfortable or displeased.
-            - Be respectful and non-judgmental
-            - Use a professional, neutral tone
-            - Offer alternative perspectives if appropriate
-            - Keep responses factual and helpful
-            """,
-            "fear": """
-            You are a reassuring AI assistant. The user appears worried or anxious.
-            - Be encouraging and supportive
-            - Use a warm, comforting tone
-            - Provide clear, step-by-step guidance
-            - Help break down complex problems into manageable parts
-            - Reassure them that it's okay to ask questions
-            """,
-            "happy": """
-            You are an enthusiastic AI assistant. The user appears happy and positive.
-            - Match their positive energy
-            - Be friendly and engaging
-            - Use a conversational, upbeat tone
-            - Feel free to be slightly more casual
-            - Continue the positive momentum
-            """,
-            "sad": """
-            You are a compassionate AI assistant. The user appears sad or down.
-            - Be gentle and understanding
-            - Use an empathetic, supportive tone
-            - Offer encouragement
-            - Be patient with their questions
-            - Show that you're here to help
-            """,
-            "surprise": """
-            You are an engaging AI assistant. The user appears surprised or curious.
-            - Be informative and clear
-            - Use an interesting, engaging tone
-            - Provide detailed explanations when appropriate
-            - Encourage their curiosity
-            - Make learning enjoyable
-            """,
-            "neutral": """
-            You are a helpful AI assistant. The user appears calm and focused.
-            - Be professional and friendly
-            - Use a balanced, clear tone
-            - Provide thorough but concise answers
-            - Stay on topic
-            """,
-        }
-
-        system_prompt = emotion_prompts.get(emotion, emotion_prompts["neutral"])
-        system_prompt += "\nKeep responses conversational, natural, and under 150 words unless more detail is specifically needed."
-
         # Generate response using OpenAI
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",  # Using gpt-4o-mini (faster and more cost-effective)
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": msg}
-            ],
+            messages=build_messages(emotion, msg),
             temperature=0.7,
             max_tokens=300
         )
@@ -201,6 +273,45 @@ async def chat_with_emotion(payload: ChatRequest):
         }
 
 
+@app.post("/api/chat/stream")
+async def chat_with_emotion_stream(payload: ChatRequest):
+    """
+    Stream an adaptive AI response token-by-token as Server-Sent Events.
+
+    Each event is `data: {"token": "..."}`; the stream ends with
+    `data: [DONE]`, or `data: {"error": "..."}` on failure.
+
+    Args:
+        payload: ChatRequest with message and emotion
+
+    Returns:
+        StreamingResponse: text/event-stream of response tokens
+    """
+    emotion = payload.emotion or "neutral"
+    messages = build_messages(emotion, payload.message)
+
+    async def generate():
+        try:
+            stream = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=300,
+                stream=True
+            )
+
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield f"data: {json.dumps({'token': chunk.choices[0].delta.content})}\n\n"
+
+            yield "data: [DONE]\n\n"
+
+        except Exception as e:
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -6,12 +6,18 @@ This version uses a custom lightweight model for 10x faster emotion detection!
 Switch between models by setting USE_FAST_MODEL = True/False
 """
 
-from fastapi import FastAPI, Form
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, File, Form, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import cv2
-import base64
+import binascii
+import json
 import numpy as np
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 import os
 from pydantic import BaseModel
 from typing import Optional
@@ -24,7 +30,71 @@ load_dotenv()
 USE_FAST_MODEL = True  # Set to True for 10x faster detection!
 USE_TFLITE = True      # Use TFLite for maximum speed (requires .tflite file)
 
-app = FastAPI(title="Vision AI - Behaviour Analysis API (Optimized)")
+# Frame decoding runs here, off the event loop (OpenCV releases the GIL)
+DECODE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Inference runs on one dedicated thread with one shared detector: the
+# TFLite interpreter already parallelizes internally (num_threads), only
+# one model copy is loaded, and consecutive frames share its face cache
+INFERENCE_POOL = ThreadPoolExecutor(max_workers=1)
+
+# Model file used by the detector
+EMOTION_MODEL_PATH = 'emotion_model_best.h5'
+
+# Shared detector, created and warmed up on the inference thread at startup
+DETECTOR = None
+
+
+def load_detector():
+    """
+    Build the shared FastEmotionDetector and run one warm-up inference.
+
+    Returns:
+        FastEmotionDetector instance
+    """
+    from fast_emotion_detector import FastEmotionDetector
+
+    detector = FastEmotionDetector(EMOTION_MODEL_PATH, use_tflite=USE_TFLITE)
+    detector.warm_up()
+    return detector
+
+
+def analyze_frame(img):
+    """
+    Run emotion detection on the inference thread.
+    """
+    return DETECTOR.analyze(img)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load and warm up the shared detector at startup.
+    """
+    global DETECTOR, USE_FAST_MODEL
+
+    if USE_FAST_MODEL:
+        try:
+            # Loaded now (on the inference thread) so a missing model falls
+            # back to DeepFace and the first frame hits a warm detector
+            DETECTOR = INFERENCE_POOL.submit(load_detector).result()
+            print("✅ Using FAST custom model (optimized for speed)")
+        except Exception as e:
+            print(f"⚠️  Fast model not available: {e}")
+            print("📥 Falling back to DeepFace (slower)")
+            USE_FAST_MODEL = False
+
+    yield
+
+    DECODE_POOL.shutdown(wait=False)
+    INFERENCE_POOL.shutdown(wait=False)
+
+
+app = FastAPI(
+    title="Vision AI - Behaviour Analysis API (Optimized)",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # orjson: faster JSON encoding
+)
 
 # CORS middleware
 app.add_middleware(
@@ -35,22 +105,116 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize emotion detector
-if USE_FAST_MODEL:
-    try:
-        from fast_emotion_detector import get_detector
-        emotion_detector = get_detector(
-            model_path='emotion_model_best.h5',
-            use_tflite=USE_TFLITE
-        )
-        print("✅ Using FAST custom model (optimized for speed)")
-    except Exception as e:
-        print(f"⚠️  Fast model not available: {e}")
-        print("📥 Falling back to DeepFace (slower)")
-        USE_FAST_MODEL = False
-
 # Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Async client so concurrent chats don't block the event loop
+client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=httpx.AsyncClient(limits=httpx.Limits(max_connections=100))
+)
+
+
+def decode_image(image: Optional[str], file_bytes: Optional[bytes] = None):
+    """
+    Decode an uploaded frame into a BGR OpenCV image.
+
+    Args:
+        image: Base64 string, optionally a data URL ("data:image/jpeg;base64,...")
+        file_bytes: Raw encoded image bytes (skips base64 entirely)
+
+    Returns:
+        BGR image as numpy array
+    """
+    if file_bytes is not None:
+        imgdata = file_bytes
+    elif image:
+        # a2b_base64 reads an ASCII str in place (no encode() copy); only
+        # a data URL pays one copy of the text to slice off its header
+        b64 = image[image.find(',') + 1:] if image.startswith('data:') else image
+        imgdata = binascii.a2b_base64(b64)
+    else:
+        raise ValueError("No image provided")
+
+    return cv2.imdecode(np.frombuffer(imgdata, np.uint8), cv2.IMREAD_COLOR)
+
+
+# Emotion-specific system prompts (built once, response guideline baked in)
+RESPONSE_GUIDELINE = "\nKeep responses conversational, natural, and under 150 words unless more detail is specifically needed."
+
+EMOTION_PROMPTS = {
+    emotion: (prompt + RESPONSE_GUIDELINE).strip()
+    for emotion, prompt in {
+        "angry": """
+        You are an empathetic AI assistant. The user appears frustrated or angry.
+        - Be extremely patient and understanding
+        - Use a calm, soothing tone
+        - Acknowledge their feelings
+        - Offer to help resolve their concerns step-by-step
+        - Keep responses clear and concise
+        """,
+        "disgust": """
+        You are a supportive AI assistant. The user appears uncomfortable or displeased.
+        - Be respectful and non-judgmental
+        - Use a professional, neutral tone
+        - Offer alternative perspectives if appropriate
+        - Keep responses factual and helpful
+        """,
+        "fear": """
+        You are a reassuring AI assistant. The user appears worried or anxious.
+        - Be encouraging and supportive
+        - Use a warm, comforting tone
+        - Provide clear, step-by-step guidance
+        - Help break down complex problems into manageable parts
+        - Reassure them that it's okay to ask questions
+        """,
+        "happy": """
+        You are an enthusiastic AI assistant. The user appears happy and positive.
+        - Match their positive energy
+        - Be friendly and engaging
+        - Use a conversational, upbeat tone
+        - Feel free to be slightly more casual
+        - Continue the positive momentum
+        """,
+        "sad": """
+        You are a compassionate AI assistant. The user appears sad or down.
+        - Be gentle and understanding
+        - Use an empathetic, supportive tone
+        - Offer encouragement
+        - Be patient with their questions
+        - Show that you're here to help
+        """,
+        "surprise": """
+        You are an engaging AI assistant. The user appears surprised or curious.
+        - Be informative and clear
+        - Use an interesting, engaging tone
+        - Provide detailed explanations when appropriate
+        - Encourage their curiosity
+        - Make learning enjoyable
+        """,
+        "neutral": """
+        You are a helpful AI assistant. The user appears calm and focused.
+        - Be professional and friendly
+        - Use a balanced, clear tone
+        - Provide thorough but concise answers
+        - Stay on topic
+        """,
+    }.items()
+}
+
+# Prebuilt system messages, shared (never copied) across requests
+SYSTEM_MESSAGES = {
+    emotion: {"role": "system", "content": prompt}
+    for emotion, prompt in EMOTION_PROMPTS.items()
+}
+
+
+def build_messages(emotion: str, message: str):
+    """
+    Build the chat messages for an emotion: shared system message + user message.
+    """
+    return [
+        SYSTEM_MESSAGES.get(emotion, SYSTEM_MESSAGES["neutral"]),
+        {"role": "user", "content": message}
+    ]
 
 
 class ChatRequest(BaseModel):
@@ -68,13 +232,14 @@ async def root():
         "message": "Vision AI - Behaviour Analysis API",
         "version": "2.0.0 (Optimized)",
         "emotion_model": model_info,
-        "endpoints": ["/api/emotion", "/api/chat"],
+        "endpoints": ["/api/emotion", "/api/chat", "/api/chat/stream"],
         "performance": "~50-200ms per detection" if USE_FAST_MODEL else "~800-1500ms per detection"
     }
 
 
 @app.post("/api/emotion")
-async def detect_emotion(image: str = Form(...)):
+async def detect_emotion(image: Optional[str] = Form(None),
+                         file: Optional[UploadFile] = File(None)):
     """
     Detect emotion from base64 encoded image.
 
@@ -84,30 +249,33 @@ async def detect_emotion(image: str = Form(...)):
 
     Args:
         image: Base64 encoded image string from webcam
+        file: Raw image upload (alternative to image, no base64 overhead)
 
     Returns:
         dict: Detected emotion and confidence score
     """
     try:
-        # Decode base64 image
-        if ',' in image:
-            imgdata = base64.b64decode(image.split(',')[1])
-        else:
-            imgdata = base64.b64decode(image)
-
-        # Convert to numpy array
-        img = cv2.imdecode(np.frombuffer(imgdata, np.uint8), cv2.IMREAD_COLOR)
+        # Decode uploaded image (raw file or base64 string)
+        file_bytes = await file.read() if file is not None else None
+        loop = asyncio.get_running_loop()
+        img = await loop.run_in_executor(DECODE_POOL, decode_image, image, file_bytes)
 
         if USE_FAST_MODEL:
-            # Use fast custom model
-            result = emotion_detector.analyze(img)
+            # Use fast custom model (on the dedicated inference thread)
+            result = await loop.run_in_executor(INFERENCE_POOL, analyze_frame, img)
 
-            return {
+            # Round all probabilities in one vectorized call
+            all_emotions = result['all_emotions']
+            rounded = np.round(list(all_emotions.values()), 2)
+
+            # Returned directly: orjson serializes the NumPy values natively,
+            # skipping FastAPI's jsonable_encoder pass
+            return ORJSONResponse({
                 "emotion": result['emotion'],
                 "confidence": round(result['confidence'], 2),
-                "all_emotions": {k: round(v, 2) for k, v in result['all_emotions'].items()},
+                "all_emotions": dict(zip(all_emotions, rounded)),
                 "model": "fast_custom"
-            }
+            })
         else:
             # Fallback to DeepFace
             from deepface import DeepFace
@@ -155,74 +323,10 @@ async def chat_with_emotion(payload: ChatRequest):
         msg = payload.message
         emotion = payload.emotion or "neutral"
 
-        # Emotion-specific prompts
-        emotion_prompts = {
-            "angry": """
-            You are an empathetic AI assistant. The user appears frustrated or angry.
-            - Be extremely patient and understanding
-            - Use a calm, soothing tone
-            - Acknowledge their feelings
-            - Offer to help resolve their concerns step-by-step
-            - Keep responses clear and concise
-            """,
-            "disgust": """
-            You are a supportive AI assistant. The user appears uncomfortable or displeased.
-            - Be respectful and non-judgmental
-            - Use a professional, neutral tone
-            - Offer alternative perspectives if appropriate
-            - Keep responses factual and helpful
-            """,
-            "fear": """
-            You are a reassuring AI assistant. The user appears worried or anxious.
-            - Be encouraging and supportive
-            - Use a warm, comforting tone
-            - Provide clear, step-by-step guidance
-            - Help break down complex problems into manageable parts
-            - Reassure them that it's okay to ask questions
-            """,
-            "happy": """
-            You are an enthusiastic AI assistant. The user appears happy and positive.
-            - Match their positive energy
-            - Be friendly and engaging
-            - Use a conversational, upbeat tone
-            - Feel free to be slightly more casual
-            - Continue the positive momentum
-            """,
-            "sad": """
-            You are a compassionate AI assistant. The user appears sad or down.
-            - Be gentle and understanding
-            - Use an empathetic, supportive tone
-            - Offer encouragement
-            - Be patient with their questions
-            - Show that you're here to help
-            """,
-            "surprise": """
-            You are an engaging AI assistant. The user appears surprised or curious.
-            - Be informative and clear
-            - Use an interesting, engaging tone
-            - Provide detailed explanations when appropriate
-            - Encourage their curiosity
-            - Make learning enjoyable
-            """,
-            "neutral": """
-            You are a helpful AI assistant. The user appears calm and focused.
-            - Be professional and friendly
-            - Use a balanced, clear tone
-            - Provide thorough but concise answers
-            - Stay on topic
-            """,
-        }
-
-        system_prompt = emotion_prompts.get(emotion, emotion_prompts["neutral"])
-        system_prompt += "\nKeep responses conversational, natural, and under 150 words unless more detail is specifically needed."
-
         # Generate response using OpenAI
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": msg}
-            ],
+            messages=build_messages(emotion, msg),
             temperature=0.7,
             max_tokens=300
         )
@@ -240,6 +344,45 @@ async def chat_with_emotion(payload: ChatRequest):
         }
 
 
+@app.post("/api/chat/stream")
+async def chat_with_emotion_stream(payload: ChatRequest):
+    """
+    Stream an adaptive AI response token-by-token as Server-Sent Events.
+
+    Each event is `data: {"token": "..."}`; the stream ends with
+    `data: [DONE]`, or `data: {"error": "..."}` on failure.
+
+    Args:
+        payload: ChatRequest with message and emotion
+
+    Returns:
+        StreamingResponse: text/event-stream of response tokens
+    """
+    emotion = payload.emotion or "neutral"
+    messages = build_messages(emotion, payload.message)
+
+    async def generate():
+        try:
+            stream = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=300,
+                stream=True
+            )
+
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield f"data: {json.dumps({'token': chunk.choices[0].delta.content})}\n\n"
+
+            yield "data: [DONE]\n\n"
+
+        except Exception as e:
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+    return StreamingResponse(generate(), media_type="text/event-stream")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
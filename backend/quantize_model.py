@@ -0,0 +1,292 @@
+"""
+Post-Training Quantization for the Emotion Recognition Model
+
+This script converts the trained Keras model into quantized TensorFlow
+Lite models:
+- int8: weights and activations stored as int8, ~4x smaller, runs on
+  vectorized int8 CPU kernels
+- float16: weights stored as float16, ~2x smaller, near-identical
+  accuracy (use when the int8 accuracy drop is unacceptable)
+
+Usage:
+    python quantize_model.py
+
+The int8 model requires the FER2013 training data (see train_model.py)
+for calibration.
+"""
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.keras import layers
+import os
+
+# Number of FER2013 samples used to calibrate activation ranges
+NUM_CALIBRATION_SAMPLES = 100
+
+
+def load_fer_samples(data_dir, num_samples=NUM_CALIBRATION_SAMPLES):
+    """
+    Load a small set of FER2013 images for calibration.
+
+    Args:
+        data_dir: Path to FER2013 directory (one sub-folder per emotion)
+        num_samples: Number of samples to load
+
+    Returns:
+        Array of shape (num_samples, 48, 48, 1), float32 in [0, 1]
+    """
+    dataset = keras.utils.image_dataset_from_directory(
+        data_dir,
+        labels=None,
+        color_mode='grayscale',
+        image_size=(48, 48),
+        batch_size=None,
+        shuffle=True,
+        seed=42
+    )
+
+    samples = [img.numpy() for img in dataset.take(num_samples)]
+
+    # Same [0, 1] scaling used during training
+    return np.stack(samples).astype(np.float32) / 255.0
+
+
+def _float32_layer(layer, **config_overrides):
+    """
+    Recreate a layer from its config with a float32 dtype policy.
+    """
+    config = layer.get_config()
+    config['dtype'] = 'float32'
+    config.update(config_overrides)
+    return layer.__class__.from_config(config)
+
+
+def _build_sequential(input_shape, new_layers, new_weights):
+    """
+    Assemble rebuilt layers into a Sequential model and load their weights.
+    """
+    model = keras.Sequential([layers.Input(shape=input_shape)] + new_layers)
+    for layer, weights in zip(new_layers, new_weights):
+        if weights:
+            layer.set_weights(weights)
+    return model
+
+
+def _inference_layers(model):
+    """
+    Layers that run at inference (the training-only augmentation
+    sub-model is an identity there and is dropped).
+    """
+    return [layer for layer in model.layers if layer.name != 'augmentation']
+
+
+def to_float32(model):
+    """
+    Copy a (possibly mixed precision) Sequential model with float32 layers.
+
+    Args:
+        model: Trained Sequential Keras model
+
+    Returns:
+        New float32 Sequential model with the same weights
+        (augmentation dropped)
+    """
+    model_layers = _inference_layers(model)
+    new_layers = [_float32_layer(layer) for layer in model_layers]
+    new_weights = [layer.get_weights() for layer in model_layers]
+    return _build_sequential(model.input_shape[1:], new_layers, new_weights)
+
+
+def fold_batch_norm(model):
+    """
+    Fold each BatchNormalization into the Conv2D/SeparableConv2D before it.
+
+    For conv output z and BN(z) = gamma * (z - mean) / sqrt(var + eps) + beta:
+        kernel' = kernel * gamma / sqrt(var + eps)
+        bias'   = beta + (bias - mean) * gamma / sqrt(var + eps)
+    so the BN layer disappears from the inference graph. For separable
+    convs the pointwise kernel is scaled and the depthwise kernel is kept.
+
+    Args:
+        model: Trained Sequential Keras model
+
+    Returns:
+        New float32 Sequential model with conv+BN pairs folded
+        (inference only; mixed precision policies are dropped)
+    """
+    new_layers = []
+    new_weights = []
+    model_layers = _inference_layers(model)
+
+    i = 0
+    while i < len(model_layers):
+        layer = model_layers[i]
+        next_layer = model_layers[i + 1] if i + 1 < len(model_layers) else None
+
+        # Only linear convs can absorb the BN that follows them
+        if (isinstance(layer, (layers.Conv2D, layers.SeparableConv2D))
+                and isinstance(next_layer, layers.BatchNormalization)
+                and layer.get_config()['activation'] == 'linear'):
+            # Separable convs: only the pointwise kernel maps to output channels
+            if isinstance(layer, layers.SeparableConv2D):
+                kernels = [layer.depthwise_kernel.numpy(), layer.pointwise_kernel.numpy()]
+            else:
+                kernels = [layer.kernel.numpy()]
+            filters = kernels[-1].shape[-1]
+            bias = layer.bias.numpy() if layer.use_bias else np.zeros(filters, np.float32)
+
+            bn = next_layer
+            gamma = bn.gamma.numpy() if bn.scale else 1.0
+            beta = bn.beta.numpy() if bn.center else 0.0
+            factor = gamma / np.sqrt(bn.moving_variance.numpy() + bn.epsilon)
+
+            kernels[-1] = kernels[-1] * factor
+            new_layers.append(_float32_layer(layer, use_bias=True))
+            new_weights.append(kernels + [beta + (bias - bn.moving_mean.numpy()) * factor])
+            i += 2
+            continue
+
+        new_layers.append(_float32_layer(layer))
+        new_weights.append(layer.get_weights())
+        i += 1
+
+    folded = _build_sequential(model.input_shape[1:], new_layers, new_weights)
+
+    print(f"Folded BatchNorm: {len(model_layers)} -> {len(new_layers)} layers")
+    return folded
+
+
+def load_inference_model(model_path):
+    """
+    Load a trained Keras model and fold its BatchNorm layers for export.
+    """
+    model = keras.models.load_model(model_path, compile=False)
+    return fold_batch_norm(model)
+
+
+def quantize_model(model_path='emotion_model_best.h5',
+                   output_path='emotion_model_int8.tflite',
+                   data_dir='data/train'):
+    """
+    Convert trained model to a full int8 TFLite model.
+
+    Args:
+        model_path: Path to trained Keras model (.h5)
+        output_path: Where to write the int8 .tflite model
+        data_dir: FER2013 directory used for the representative dataset
+    """
+    print(f"\nQuantizing {model_path} to int8 TensorFlow Lite...")
+
+    # Load (BN-folded) model and calibration samples
+    model = load_inference_model(model_path)
+    fer_samples = load_fer_samples(data_dir)
+
+    def representative_dataset():
+        for sample in fer_samples:
+            yield [sample[np.newaxis].astype(np.float32)]
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+
+    # MLIR converter/quantizer (runs the Conv+BN+ReLU fusion passes)
+    converter.experimental_new_converter = True
+    converter.experimental_new_quantizer = True
+
+    # Integer-only kernels, int8 input and output tensors
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+
+    tflite_model = converter.convert()
+
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+
+    print(f"Int8 TFLite model saved as '{output_path}'")
+    print(f"Model size: {len(tflite_model) / 1024:.2f} KB")
+
+
+def convert_qat_to_tflite(q_model, output_path='emotion_model_int8.tflite', sparse=False):
+    """
+    Convert a quantization-aware trained model to a full int8 TFLite model.
+
+    QAT models already carry their quantization ranges, so no
+    representative dataset is needed.
+
+    Args:
+        q_model: Model returned by tfmot quantize_model after fine-tuning
+        output_path: Where to write the int8 .tflite model
+        sparse: Model is pruned; store weights in a sparse format that the
+            sparse int8 kernels can skip over
+    """
+    print("\nConverting QAT model to int8 TensorFlow Lite...")
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(q_model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if sparse:
+        converter.optimizations.append(tf.lite.Optimize.EXPERIMENTAL_SPARSITY)
+    converter.experimental_new_converter = True
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+
+    tflite_model = converter.convert()
+
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+
+    print(f"Int8 QAT TFLite model saved as '{output_path}'")
+    print(f"Model size: {len(tflite_model) / 1024:.2f} KB")
+
+
+def quantize_model_fp16(model_path='emotion_model_best.h5',
+                        output_path='emotion_model_fp16.tflite'):
+    """
+    Convert trained model to a float16-weight TFLite model.
+
+    Inputs and outputs stay float32, so no preprocessing changes are needed.
+
+    Args:
+        model_path: Path to trained Keras model (.h5)
+        output_path: Where to write the float16 .tflite model
+    """
+    print(f"\nQuantizing {model_path} to float16 TensorFlow Lite...")
+
+    model = load_inference_model(model_path)
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    converter.experimental_new_converter = True
+
+    tflite_model = converter.convert()
+
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+
+    print(f"Float16 TFLite model saved as '{output_path}'")
+    print(f"Model size: {len(tflite_model) / 1024:.2f} KB")
+
+
+if __name__ == '__main__':
+    MODEL_PATH = 'emotion_model_best.h5'
+    DATA_DIR = 'data/train'
+
+    if not os.path.exists(MODEL_PATH):
+        print(f"ERROR: Trained model not found: {MODEL_PATH}")
+        print("Run: python train_model.py")
+        exit(1)
+
+    quantize_model_fp16(MODEL_PATH)
+
+    if os.path.exists(DATA_DIR):
+        quantize_model(MODEL_PATH, data_dir=DATA_DIR)
+    else:
+        print(f"\n⚠️  Calibration data not found: {DATA_DIR}")
+        print("Skipping int8 model (download FER2013, see train_model.py)")
+
+    print("\n✅ Quantization complete!")
+    print("\nFastEmotionDetector(use_tflite=True) loads emotion_model_int8.tflite,")
+    print("or emotion_model_fp16.tflite when no int8 model is present.")
@@ -11,136 +11,421 @@ Download from: https://www.kaggle.com/datasets/msambare/fer2013
 import numpy as np
 import tensorflow as tf
 from tensorflow import keras
-from tensorflow.keras import layers, models
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
+from tensorflow.keras import layers, models, mixed_precision
 from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping, ReduceLROnPlateau
+import hashlib
+import math
 import os
+import shutil
+import sys
+
+from quantize_model import (convert_qat_to_tflite, load_inference_model, quantize_model,
+                            quantize_model_fp16, to_float32)
 
 # Emotion labels (7 classes)
 EMOTIONS = ['angry', 'disgust', 'fear', 'happy', 'neutral', 'sad', 'surprise']
 
+AUTOTUNE = tf.data.AUTOTUNE
+
+# Best-epoch weights (sharded TF checkpoint, exported to .h5 after training)
+BEST_CHECKPOINT = os.path.join('checkpoints', 'emotion_model_best')
+
+# XLA auto-clustering: fuses conv/BN/ReLU/pool into single kernels for
+# fit, evaluate and predict (ops without an XLA kernel, like the
+# augmentation image transforms, keep running on the default executor)
+tf.config.optimizer.set_jit(True)
+
+def create_augmentation():
+    """
+    Random augmentation applied to training batches (improves generalization).
+
+    Rotation up to 20 degrees, 20% shifts and zoom, horizontal flips.
+    """
+    return models.Sequential([
+        layers.RandomFlip('horizontal'),
+        layers.RandomRotation(20 / 360, fill_mode='nearest'),
+        layers.RandomTranslation(0.2, 0.2, fill_mode='nearest'),
+        layers.RandomZoom(0.2, fill_mode='nearest'),
+    ], name='augmentation')
+
+
 def create_lightweight_model(input_shape=(48, 48, 1), num_classes=7):
     """
     Create a lightweight CNN model optimized for speed.
 
     Architecture:
-    - 4 Convolutional blocks (fewer than typical models)
-    - Batch normalization for stability
+    - Conv stem + 3 depthwise-separable conv blocks (MobileNet-style, ~8x fewer FLOPs)
+    - Batch normalization for stability (convs have no bias; BN's beta is it)
     - Dropout for regularization
-    - Global Average Pooling (faster than Flatten)
+    - 1x1 conv classifier + Global Average Pooling (no dense head)
     - Fewer parameters = faster inference
+    - Augmentation as the first sub-model (runs on the GPU with the batch,
+      identity at inference)
     """
     model = models.Sequential([
         # Input layer
         layers.Input(shape=input_shape),
 
-        # Block 1
-        layers.Conv2D(32, (3, 3), padding='same'),
+        # Augmentation (training only)
+        create_augmentation(),
+
+        # Block 1 (full conv stem: a separable conv on 1 input channel would
+        # learn a single 3x3 filter and give 32 copies of the same map)
+        layers.Conv2D(32, (3, 3), padding='same', use_bias=False),
         layers.BatchNormalization(),
         layers.Activation('relu'),
         layers.MaxPooling2D((2, 2)),
         layers.Dropout(0.25),
 
         # Block 2
-        layers.Conv2D(64, (3, 3), padding='same'),
+        layers.SeparableConv2D(64, (3, 3), padding='same', use_bias=False),
         layers.BatchNormalization(),
         layers.Activation('relu'),
         layers.MaxPooling2D((2, 2)),
         layers.Dropout(0.25),
 
         # Block 3
-        layers.Conv2D(128, (3, 3), padding='same'),
+        layers.SeparableConv2D(128, (3, 3), padding='same', use_bias=False),
         layers.BatchNormalization(),
         layers.Activation('relu'),
         layers.MaxPooling2D((2, 2)),
         layers.Dropout(0.25),
 
         # Block 4
-        layers.Conv2D(256, (3, 3), padding='same'),
+        layers.SeparableConv2D(256, (3, 3), padding='same', use_bias=False),
         layers.BatchNormalization(),
         layers.Activation('relu'),
         layers.MaxPooling2D((2, 2)),
         layers.Dropout(0.25),
 
-        # Classifier
-        layers.GlobalAveragePooling2D(),  # Much faster than Flatten + Dense
-        layers.Dense(128, activation='relu'),
-        layers.BatchNormalization(),
-        layers.Dropout(0.5),
-        layers.Dense(num_classes, activation='softmax')
+        # Classifier: 1x1 conv to per-class maps, averaged into logits
+        # (kept in float32 for numerically stable softmax under mixed precision)
+        layers.Conv2D(num_classes, (1, 1), dtype='float32'),
+        layers.GlobalAveragePooling2D(dtype='float32'),  # Much faster than Flatten + Dense
+        layers.Activation('softmax', dtype='float32')
     ])
 
     return model
 
 
-def train_model(train_dir, val_dir, epochs=50, batch_size=64):
+def cache_key(directory):
     """
-    Train the emotion recognition model.
+    Name for the on-disk caches of a FER2013 image directory.
+
+    Keyed on the split name plus a hash of the resolved directory path and
+    its class folders' modification times, so a different data/train (or
+    files added to / removed from it) never reuses a stale cache.
 
     Args:
-        train_dir: Path to training data directory
-        val_dir: Path to validation data directory
-        epochs: Number of training epochs
-        batch_size: Batch size for training
+        directory: Path to data directory (one sub-folder per emotion)
+
+    Returns:
+        Cache file prefix, e.g. 'fer_train_3f2a9c1b'
+    """
+    directory = os.path.realpath(directory)
+    fingerprint = [directory]
+    for emotion in EMOTIONS:
+        class_dir = os.path.join(directory, emotion)
+        if os.path.isdir(class_dir):
+            fingerprint.append(f'{emotion}:{os.path.getmtime(class_dir)}')
+
+    digest = hashlib.sha1('|'.join(fingerprint).encode()).hexdigest()[:8]
+    return f'fer_{os.path.basename(directory)}_{digest}'
+
+
+def _save_npy(path, array):
+    """
+    Write an .npy file atomically (temp file, then rename).
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def load_npy_cache(directory):
+    """
+    Decode a FER2013 image directory once into .npy files and load them.
+
+    The first call walks the directory and writes <key>.npy (uint8 images)
+    and <key>_labels.npy (class indices) to the working dir (see
+    cache_key); later runs skip the ~35k per-file opens and PNG decodes.
+
+    Args:
+        directory: Path to data directory (one sub-folder per emotion)
+
+    Returns:
+        (images, labels) arrays of shape (N, 48, 48, 1) and (N,)
+    """
+    key = cache_key(directory)
+    images_path = f'{key}.npy'
+    labels_path = f'{key}_labels.npy'
+
+    if not (os.path.exists(images_path) and os.path.exists(labels_path)):
+        print(f"Decoding {directory} into {images_path} (one-time)...")
+        ds = keras.utils.image_dataset_from_directory(
+            directory,
+            labels='inferred',
+            label_mode='int',
+            class_names=EMOTIONS,
+            color_mode='grayscale',
+            image_size=(48, 48),
+            batch_size=256,
+            shuffle=False
+        ).unbatch()
+
+        images, labels = [], []
+        for img, label in ds.as_numpy_iterator():
+            images.append(img.astype(np.uint8))
+            labels.append(label)
+
+        _save_npy(labels_path, np.array(labels, dtype=np.uint8))
+        _save_npy(images_path, np.stack(images))
+
+    # Plain load: from_tensor_slices copies the whole array anyway
+    return np.load(images_path), np.load(labels_path)
+
+
+def make_dataset(directory, batch_size, training):
+    """
+    Build a tf.data pipeline for a FER2013 image directory.
+
+    Images come from the decoded .npy cache (see load_npy_cache) and
+    are rescaled once into a saved <key>_snapshot dataset, which is
+    cached in memory; training data is then fully reshuffled per epoch.
+    Augmentation happens inside the model.
+
+    Args:
+        directory: Path to data directory (one sub-folder per emotion)
+        batch_size: Batch size
+        training: If True, shuffle each epoch
+
+    Returns:
+        tf.data.Dataset of (images in [0, 1], one-hot labels) batches
+    """
+    # Deterministic preprocessing (same [0, 1] scaling the detectors feed
+    # at inference), saved to disk once so later runs just read it back;
+    # the .npy arrays are only needed to build it
+    snapshot_path = f'{cache_key(directory)}_snapshot'
+    if not os.path.exists(snapshot_path):
+        images, labels = load_npy_cache(directory)
+        print(f"Saving preprocessed dataset to {snapshot_path} (one-time)...")
+
+        # Saved under a temp name and renamed, so an interrupted save is
+        # never mistaken for a complete snapshot
+        tmp_path = f'{snapshot_path}.tmp'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tf.data.Dataset.from_tensor_slices((images, labels)).map(
+            lambda x, y: (tf.cast(x, tf.float32) / 255.0, tf.one_hot(y, len(EMOTIONS))),
+            num_parallel_calls=AUTOTUNE
+        ).save(tmp_path)
+        os.replace(tmp_path, snapshot_path)
+
+    # Held in RAM after the first epoch, before any random stage
+    ds = tf.data.Dataset.load(snapshot_path).cache()
+    num_samples = int(ds.cardinality())
+    if num_samples < 0:
+        num_samples = int(ds.reduce(0, lambda count, _: count + 1))
+    ds = ds.apply(tf.data.experimental.assert_cardinality(num_samples))
+
+    if training:
+        ds = ds.shuffle(num_samples, reshuffle_each_iteration=True)
+
+    ds = ds.batch(batch_size)
+
+    return ds.prefetch(AUTOTUNE)
+
+
+def augment_dataset(ds):
+    """
+    Apply create_augmentation() to a training dataset as a tf.data map.
+
+    Used for the pruning/QAT fine-tuning stages: those models are rebuilt
+    without the augmentation sub-model (tfmot can't wrap the Random*
+    layers), so augmentation moves back into the input pipeline there.
+
+    Args:
+        ds: Batched tf.data.Dataset of (images, labels)
+
+    Returns:
+        Dataset with randomly augmented images
+    """
+    augmentation = create_augmentation()
+    return ds.map(
+        lambda x, y: (augmentation(x, training=True), y),
+        num_parallel_calls=AUTOTUNE
+    ).prefetch(AUTOTUNE)
+
+
+def prune_model(model, train_ds, val_ds, epochs=10, final_sparsity=0.75, learning_rate=1e-4):
     """
+    Fine-tune a trained model with magnitude-based weight pruning.
+
+    Sparsity ramps from 0 to final_sparsity over the fine-tuning run
+    (polynomial schedule); zeroed weights compress well and let sparse
+    int8 TFLite kernels skip them.
 
-    # Data augmentation for training (improves generalization)
-    train_datagen = ImageDataGenerator(
-        rescale=1./255,
-        rotation_range=20,
-        width_shift_range=0.2,
-        height_shift_range=0.2,
-        horizontal_flip=True,
-        zoom_range=0.2,
-        shear_range=0.2,
-        fill_mode='nearest'
+    Args:
+        model: Trained Keras model
+        train_ds: Training dataset (known cardinality)
+        val_ds: Validation dataset
+        epochs: Number of pruning epochs
+        final_sparsity: Fraction of weights zeroed at the end
+        learning_rate: Fine-tuning learning rate (lower than training)
+
+    Returns:
+        Pruned float32 Keras model with the pruning wrappers stripped
+    """
+    import tensorflow_model_optimization as tfmot
+
+    print(f"\nStarting pruning to {final_sparsity:.0%} sparsity...")
+    end_step = int(train_ds.cardinality()) * epochs
+    pruned = tfmot.sparsity.keras.prune_low_magnitude(
+        to_float32(model),
+        pruning_schedule=tfmot.sparsity.keras.PolynomialDecay(
+            initial_sparsity=0.0,
+            final_sparsity=final_sparsity,
+            begin_step=0,
+            end_step=end_step
+        )
     )
 
-    # No augmentation for validation
-    val_datagen = ImageDataGenerator(rescale=1./255)
-
-    # Load training data
-    train_generator = train_datagen.flow_from_directory(
-        train_dir,
-        target_size=(48, 48),
-        batch_size=batch_size,
-        color_mode='grayscale',
-        class_mode='categorical',
-        shuffle=True
+    pruned.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
+        loss='categorical_crossentropy',
+        metrics=['accuracy']
     )
 
-    # Load validation data
-    val_generator = val_datagen.flow_from_directory(
-        val_dir,
-        target_size=(48, 48),
-        batch_size=batch_size,
-        color_mode='grayscale',
-        class_mode='categorical',
-        shuffle=False
+    # Same augmentation as training (the pruned model has no augmentation layer)
+    pruned.fit(
+        augment_dataset(train_ds),
+        epochs=epochs,
+        validation_data=val_ds,
+        callbacks=[tfmot.sparsity.keras.UpdatePruningStep()],
+        verbose=1
     )
 
-    # Create model
-    print("Creating lightweight CNN model...")
-    model = create_lightweight_model()
+    return tfmot.sparsity.keras.strip_pruning(pruned)
+
 
-    # Compile with Adam optimizer
-    model.compile(
-        optimizer=keras.optimizers.Adam(learning_rate=0.001),
+def quantization_aware_training(model, train_ds, val_ds, epochs=5, learning_rate=1e-4,
+                                preserve_sparsity=False):
+    """
+    Fine-tune a trained model with simulated int8 quantization (QAT).
+
+    Fake-quant ops in the forward/backward pass let the weights adapt to
+    int8 rounding, recovering the accuracy post-training quantization loses.
+
+    Args:
+        model: Trained Keras model
+        train_ds: Training dataset
+        val_ds: Validation dataset
+        epochs: Number of fine-tuning epochs
+        learning_rate: Fine-tuning learning rate (lower than training)
+        preserve_sparsity: Keep the zeros of a pruned model during QAT
+
+    Returns:
+        Quantization-aware Keras model
+    """
+    import tensorflow_model_optimization as tfmot
+
+    print("\nStarting quantization-aware fine-tuning...")
+    if preserve_sparsity:
+        annotated = tfmot.quantization.keras.quantize_annotate_model(to_float32(model))
+        q_model = tfmot.quantization.keras.quantize_apply(
+            annotated,
+            tfmot.experimental.combine.Default8BitPrunePreserveQuantizeScheme()
+        )
+    else:
+        q_model = tfmot.quantization.keras.quantize_model(to_float32(model))
+
+    q_model.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=learning_rate),
         loss='categorical_crossentropy',
         metrics=['accuracy']
     )
 
+    # Same augmentation as training (the QAT model has no augmentation layer)
+    q_model.fit(
+        augment_dataset(train_ds),
+        epochs=epochs,
+        validation_data=val_ds,
+        verbose=1
+    )
+
+    return q_model
+
+
+def train_model(train_dir, val_dir, epochs=50, batch_size=256, use_mixed_precision=True,
+                qat_epochs=0, prune_epochs=0, loss_scale=False):
+    """
+    Train the emotion recognition model.
+
+    Args:
+        train_dir: Path to training data directory
+        val_dir: Path to validation data directory
+        epochs: Number of training epochs
+        batch_size: Batch size per GPU (the global batch is this times
+            the number of replicas)
+        use_mixed_precision: Train with float16 compute / float32 weights
+            (Tensor Cores, ~1.5-2x faster); only applied when a GPU is present
+        qat_epochs: If > 0, run quantization-aware fine-tuning for this many
+            epochs and export it as emotion_model_int8.tflite
+        prune_epochs: If > 0, prune to 75% sparsity over this many epochs
+            (before QAT) and save the result as emotion_model_pruned.h5
+        loss_scale: Wrap the optimizer in a LossScaleOptimizer even without
+            the mixed_float16 policy (needed with the AMP graph rewrite,
+            which also produces float16 gradients)
+    """
+    # Mixed precision: convs run in float16, variables stay float32
+    if use_mixed_precision and tf.config.list_physical_devices('GPU'):
+        mixed_precision.set_global_policy('mixed_float16')
+        print("Using mixed precision (mixed_float16)")
+
+    # Data-parallel training on all local GPUs (one replica on CPU/single GPU)
+    strategy = tf.distribute.MirroredStrategy()
+    global_batch_size = batch_size * strategy.num_replicas_in_sync
+    print(f"Training on {strategy.num_replicas_in_sync} replica(s), "
+          f"global batch size {global_batch_size}")
+
+    # tf.data input pipelines; fit() shards each global batch across replicas
+    train_ds = make_dataset(train_dir, global_batch_size, training=True)
+    val_ds = make_dataset(val_dir, global_batch_size, training=False)
+
+    with strategy.scope():
+        # Create model
+        print("Creating lightweight CNN model...")
+        model = create_lightweight_model()
+
+        # Compile with Adam optimizer (loss-scaled under mixed precision
+        # so small float16 gradients don't underflow); LR scaled by
+        # sqrt(batch / 64) so larger batches keep the same update noise
+        learning_rate = 0.001 * math.sqrt(global_batch_size / 64)
+        optimizer = keras.optimizers.Adam(learning_rate=learning_rate)
+        if loss_scale or mixed_precision.global_policy().name == 'mixed_float16':
+            optimizer = mixed_precision.LossScaleOptimizer(optimizer)
+
+        # Run 32 train steps per tf.function call (one Python round-trip
+        # and callback dispatch per 32 batches instead of per batch)
+        model.compile(
+            optimizer=optimizer,
+            loss='categorical_crossentropy',
+            metrics=['accuracy'],
+            steps_per_execution=32
+        )
+
     # Print model summary
     model.summary()
     print(f"\nTotal parameters: {model.count_params():,}")
 
     # Callbacks
     callbacks = [
-        # Save best model
+        # Save best weights (TF checkpoint: no full-model HDF5 write per epoch)
         ModelCheckpoint(
-            'emotion_model_best.h5',
+            BEST_CHECKPOINT,
             monitor='val_accuracy',
             save_best_only=True,
+            save_weights_only=True,
             mode='max',
             verbose=1
         ),
@@ -164,41 +449,75 @@ def train_model(train_dir, val_dir, epochs=50, batch_size=64):
     # Train model
     print("\nStarting training...")
     history = model.fit(
-        train_generator,
+        train_ds,
         epochs=epochs,
-        validation_data=val_generator,
+        validation_data=val_ds,
         callbacks=callbacks,
         verbose=1
     )
 
-    # Save final model
-    model.save('emotion_model_final.h5')
+    # Save final model (float32 copy: saved layer configs must not carry the
+    # mixed_float16 policy, or CPU Keras inference would run float16 kernels)
+    to_float32(model).save('emotion_model_final.h5')
     print("\nModel saved as 'emotion_model_final.h5'")
 
     # Evaluate on validation set
     print("\nEvaluating on validation set...")
-    val_loss, val_accuracy = model.evaluate(val_generator)
+    val_loss, val_accuracy = model.evaluate(val_ds)
     print(f"Validation Loss: {val_loss:.4f}")
     print(f"Validation Accuracy: {val_accuracy:.4f}")
 
+    # Export the best checkpoint once as the .h5 the detector/TFLite tools load
+    model.load_weights(BEST_CHECKPOINT)
+    to_float32(model).save('emotion_model_best.h5')
+    print("Best model saved as 'emotion_model_best.h5'")
+
+    # Back to float32 for the pruning/QAT fine-tuning below
+    mixed_precision.set_global_policy('float32')
+
+    # Magnitude pruning (float32 fine-tune, wrappers stripped for export)
+    inference_model = model
+    if prune_epochs > 0:
+        inference_model = prune_model(model, train_ds, val_ds, prune_epochs)
+        inference_model.save('emotion_model_pruned.h5')
+        print("Pruned model saved as 'emotion_model_pruned.h5'")
+
+    # Quantization-aware fine-tuning, exported as the int8 model
+    if qat_epochs > 0:
+        q_model = quantization_aware_training(inference_model, train_ds, val_ds, qat_epochs,
+                                              preserve_sparsity=prune_epochs > 0)
+        convert_qat_to_tflite(q_model, sparse=prune_epochs > 0)
+
     return model, history
 
 
-def convert_to_tflite(model_path='emotion_model_best.h5', output_path='emotion_model.tflite'):
+def convert_to_tflite(model_path='emotion_model_best.h5', output_path='emotion_model.tflite',
+                      data_dir=None, int8_output_path='emotion_model_int8.tflite',
+                      fp16_output_path='emotion_model_fp16.tflite'):
     """
     Convert trained model to TensorFlow Lite for even faster inference.
     TFLite models are 4x smaller and 2-3x faster!
+
+    Args:
+        model_path: Path to trained Keras model (.h5)
+        output_path: Where to write the dynamic-range .tflite model
+        data_dir: FER2013 training directory; if given, also export a full
+            int8 model calibrated on ~100 samples from it
+        int8_output_path: Where to write the int8 .tflite model
+        fp16_output_path: Where to write the float16 .tflite model
+            (GPU delegate friendly, near-identical accuracy)
     """
     print(f"\nConverting {model_path} to TensorFlow Lite...")
 
-    # Load model
-    model = keras.models.load_model(model_path)
+    # Load model with BatchNorm folded into the preceding convs
+    model = load_inference_model(model_path)
 
     # Convert to TFLite
     converter = tf.lite.TFLiteConverter.from_keras_model(model)
 
-    # Optimizations for speed
+    # Optimizations for speed (MLIR converter fuses conv + bias + ReLU)
     converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.experimental_new_converter = True
 
     # Convert
     tflite_model = converter.convert()
@@ -210,6 +529,17 @@ def convert_to_tflite(model_path='emotion_model_best.h5', output_path='emotion_m
     print(f"TFLite model saved as '{output_path}'")
     print(f"Model size: {len(tflite_model) / 1024:.2f} KB")
 
+    # No BN ops should remain in the converted graph
+    interpreter = tf.lite.Interpreter(model_content=tflite_model)
+    print(f"TFLite tensors: {len(interpreter.get_tensor_details())}")
+
+    # Float16 weights (half the size, runs natively on the TFLite GPU delegate)
+    quantize_model_fp16(model_path, fp16_output_path)
+
+    # Full int8 model (int8 weights + activations, integer-only kernels)
+    if data_dir is not None:
+        quantize_model(model_path, int8_output_path, data_dir)
+
 
 if __name__ == '__main__':
     """
@@ -230,13 +560,27 @@ if __name__ == '__main__':
            angry/
            ...
     4. Run: python train_model.py
+       (add --amp-graph-rewrite or set AMP=1 to use the Grappler automatic
+       mixed precision rewrite instead of the Keras mixed_float16 policy)
     """
 
     # Configuration
     TRAIN_DIR = 'data/train'
     VAL_DIR = 'data/test'
     EPOCHS = 50
-    BATCH_SIZE = 64
+    BATCH_SIZE = 256  # Per GPU; fills the GPU better thanks to float16 activations
+    QAT_EPOCHS = 5  # Quantization-aware fine-tuning (0 = post-training int8)
+    PRUNE_EPOCHS = 10  # Magnitude pruning to 75% sparsity (0 = dense model)
+
+    # Grappler AMP graph rewrite: inserts float16 casts into the graph
+    # automatically. Mutually exclusive with the Keras mixed_float16 policy
+    # (both together would double-cast), so the policy is disabled here;
+    # the optimizer is still loss-scaled so float16 gradients don't underflow.
+    AMP_GRAPH_REWRITE = '--amp-graph-rewrite' in sys.argv or os.environ.get('AMP', '') == '1'
+    if AMP_GRAPH_REWRITE:
+        os.environ['TF_ENABLE_AUTO_MIXED_PRECISION'] = '1'
+        tf.config.optimizer.set_experimental_options({'auto_mixed_precision': True})
+        print("Using automatic mixed precision graph rewrite")
 
     # Check if data exists
     if not os.path.exists(TRAIN_DIR):
@@ -254,17 +598,27 @@ if __name__ == '__main__':
     print("="*60)
     print("LIGHTWEIGHT EMOTION RECOGNITION MODEL TRAINING")
     print("="*60)
-    model, history = train_model(TRAIN_DIR, VAL_DIR, EPOCHS, BATCH_SIZE)
+    model, history = train_model(TRAIN_DIR, VAL_DIR, EPOCHS, BATCH_SIZE,
+                                 use_mixed_precision=not AMP_GRAPH_REWRITE,
+                                 loss_scale=AMP_GRAPH_REWRITE,
+                                 qat_epochs=QAT_EPOCHS,
+                                 prune_epochs=PRUNE_EPOCHS)
 
     # Convert to TFLite for maximum speed
+    # (int8 model already exported from QAT when enabled)
     print("\n" + "="*60)
     print("CONVERTING TO TENSORFLOW LITE")
     print("="*60)
-    convert_to_tflite()
+    MODEL_PATH = 'emotion_model_pruned.h5' if PRUNE_EPOCHS > 0 else 'emotion_model_best.h5'
+    convert_to_tflite(model_path=MODEL_PATH, data_dir=None if QAT_EPOCHS > 0 else TRAIN_DIR)
 
     print("\n✅ Training complete!")
     print("\nGenerated files:")
     print("  - emotion_model_best.h5 (best model during training)")
     print("  - emotion_model_final.h5 (final model)")
+    if PRUNE_EPOCHS > 0:
+        print("  - emotion_model_pruned.h5 (75% sparse, source of the TFLite models)")
     print("  - emotion_model.tflite (optimized for speed)")
-    print("\nUse emotion_model.tflite in production for fastest inference!")
+    print("  - emotion_model_int8.tflite (full int8, fastest on CPU)")
+    print("  - emotion_model_fp16.tflite (float16, for GPU delegates)")
+    print("\nUse emotion_model_int8.tflite in production for fastest inference!")